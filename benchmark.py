@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from mcp_server.server import serve
+from mcp_client.protocol import MCPClient
+
+# Alternating X/O moves that fill the board without a winner before the last move
+GAME_MOVES = [(0, 0, "X"), (0, 1, "O"), (0, 2, "X"), (1, 1, "O"), (1, 0, "X"),
+              (1, 2, "O"), (2, 1, "X"), (2, 0, "O"), (2, 2, "X")]
+
+def count_traffic(websocket, counters: dict):
+    # Counts message payloads handed to/from the websocket layer and the raw
+    # bytes crossing the transport, i.e. after framing and permessage-deflate
+    send, recv = websocket.send, websocket.recv
+    write, data_received = websocket.transport.write, websocket.data_received
+
+    async def counted_send(message, *args, **kwargs):
+        counters["payload_sent"] += len(message)
+        return await send(message, *args, **kwargs)
+
+    async def counted_recv(*args, **kwargs):
+        message = await recv(*args, **kwargs)
+        counters["payload_received"] += len(message)
+        return message
+
+    def counted_write(data):
+        counters["wire_sent"] += len(data)
+        return write(data)
+
+    def counted_data_received(data):
+        counters["wire_received"] += len(data)
+        return data_received(data)
+
+    websocket.send = counted_send
+    websocket.recv = counted_recv
+    websocket.transport.write = counted_write
+    websocket.data_received = counted_data_received
+
+async def run_encoding(url: str, encoding: str, requests: int) -> dict:
+    client = MCPClient(url, encoding)
+    counters = {"payload_sent": 0, "payload_received": 0, "wire_sent": 0, "wire_received": 0}
+
+    # The protocol layers log every frame; keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        await client.connect()
+        negotiated = client.encoding
+        count_traffic(client.websocket, counters)
+
+        start = time.perf_counter()
+        for i in range(requests):
+            if i % len(GAME_MOVES) == 0:
+                await client.call_tool("reset_game", {})
+            row, col, player = GAME_MOVES[i % len(GAME_MOVES)]
+            await client.call_tool("make_move", {"row": row, "col": col, "player": player})
+        elapsed = time.perf_counter() - start
+
+        await client.disconnect()
+
+    return {
+        "encoding": negotiated,
+        "requests": requests,
+        "seconds": elapsed,
+        "avg_ms": elapsed / requests * 1000,
+        **counters,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare MCP wire encodings")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = await serve("localhost", args.port)
+    url = f"ws://localhost:{args.port}"
+
+    try:
+        for encoding in ["json", "msgpack"]:
+            stats = await run_encoding(url, encoding, args.requests)
+            if stats["encoding"] != encoding:
+                print(f"{encoding}: not available (negotiated {stats['encoding']}), skipped")
+                continue
+            print(
+                f"{encoding:8} {stats['avg_ms']:.3f} ms/request | "
+                f"payload sent {stats['payload_sent']} B, received {stats['payload_received']} B | "
+                f"wire sent {stats['wire_sent']} B, received {stats['wire_received']} B "
+                f"({stats['requests']} requests, includes reset_game calls)"
+            )
+    finally:
+        server.close()
+        await server.wait_closed()
+
+if __name__ == "__main__":
+    asyncio.run(main())
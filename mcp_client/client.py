@@ -4,8 +4,8 @@ from mcp_client.protocol import MCPClient
 from mcp_client.ollama import OllamaClient
 
 class GameClient:
-    def __init__(self, mcp_url: str, ollama_url: str, ollama_model: str):
-        self.mcp_client = MCPClient(mcp_url)
+    def __init__(self, mcp_url: str, ollama_url: str, ollama_model: str, mcp_encoding: str = "json"):
+        self.mcp_client = MCPClient(mcp_url, mcp_encoding)
         self.ollama_client = OllamaClient(ollama_url, ollama_model)
     
     async def connect(self):
@@ -18,6 +18,9 @@ class GameClient:
     async def get_board_state(self) -> str:
         return await self.mcp_client.call_tool("get_board", {})
     
+    async def get_compact_board(self) -> str:
+        return await self.mcp_client.call_tool("get_board", {"format": "compact"})
+    
     async def make_human_move(self, row: int, col: int, player_symbol: str) -> str:
         return await self.mcp_client.call_tool("make_move", {
             "row": row,
@@ -26,7 +29,7 @@ class GameClient:
         })
     
     async def make_ai_move(self, ai_symbol: str) -> str:
-        board_state = await self.get_board_state()
+        board_state = await self.get_compact_board()
         available_moves = await self.mcp_client.call_tool("get_available_moves", {})
         
         if "playing" not in board_state.lower():
@@ -39,7 +42,7 @@ class GameClient:
         except:
             return "Error parsing available moves"
         
-        row, col = await self.ollama_client.generate_move(board_state, available_moves)
+        row, col = await self.ollama_client.generate_move(board_state, available_moves, ai_symbol)
         
         if (row, col) not in moves_list:
             row, col = moves_list[0]
@@ -54,7 +57,7 @@ class GameClient:
         return await self.mcp_client.call_tool("reset_game", {})
     
     async def chat_with_ai(self, message: str) -> str:
-        board_state = await self.get_board_state()
+        board_state = await self.get_compact_board()
         return await self.ollama_client.chat_with_ai(message, board_state)
     
     async def __aenter__(self):
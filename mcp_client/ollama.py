@@ -1,29 +1,71 @@
 import httpx  # type: ignore
 import json
+import os
 from typing import Dict, Any, Optional, Tuple
 
+# Static system prompts: the per-turn board goes in the user message so the
+# system prefix is byte-identical across calls and Ollama can reuse its cache
+MOVE_SYSTEM_PROMPT = """You play tic-tac-toe. The board is given as: rows split by "/", "." empty, row 0 first, next=player to move, state=game state.
+Pick the best move from the available (row,col) list: win, else block, else center, else corner.
+Reply with only "row,col". Example: 1,2"""
+
+CHAT_SYSTEM_PROMPT = """You are a cocky, competitive tic-tac-toe AI that loves playful trash talk.
+Be confident and witty but never mean; brag about your AI processing power, tease human mistakes, use gaming slang and emojis.
+Comment on the game, which is given as: rows split by "/", "." empty, next=player to move, state=game state.
+Reply in 2-4 sentences with attitude."""
+
+USAGE_FIELDS = (
+    "prompt_eval_count",
+    "eval_count",
+    "total_duration",
+    "load_duration",
+    "prompt_eval_duration",
+    "eval_duration",
+)
+
+MOVE_OPTIONS = {
+    "temperature": 0.2,
+    "num_predict": 8,  # "row,col" needs only a handful of tokens
+}
+
+CHAT_OPTIONS = {
+    "temperature": 0.8,  # Higher for more creative trash talk
+    "num_predict": 250,  # More tokens for longer responses
+    "top_p": 0.9,
+    "repeat_penalty": 1.1
+}
+
 class OllamaClient:
-    def __init__(self, base_url: str, model: str):
+    def __init__(self, base_url: str, model: str, keep_alive: Optional[str] = None):
         self.base_url = base_url.rstrip("/")
         self.model = model
+        # Keep the model resident between turns instead of reloading it
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE") or "30m"
         self.client = httpx.AsyncClient()
+        self.last_usage: Dict[str, int] = {}
+        # False when the last generate_move reply could not be parsed
+        self.last_move_parsed = False
+        # Set when the last request failed (transport/HTTP error), None otherwise
+        self.last_error: Optional[str] = None
+        # Running totals for this client, reported alongside each call
+        self.usage: Dict[str, int] = {field: 0 for field in USAGE_FIELDS}
+        self.usage["calls"] = 0
     
-    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                       options: Optional[Dict[str, Any]] = None) -> str:
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
+        self.last_usage = {}
+        self.last_error = None
         payload = {
             "model": self.model,
             "messages": messages,
             "stream": False,
-            "options": {
-                "temperature": 0.8,  # Higher for more creative trash talk
-                "num_predict": 250,  # More tokens for longer responses
-                "top_p": 0.9,
-                "repeat_penalty": 1.1
-            }
+            "keep_alive": self.keep_alive,
+            "options": options or CHAT_OPTIONS
         }
         
         try:
@@ -35,32 +77,48 @@ class OllamaClient:
             response.raise_for_status()
             
             data = response.json()
+            self._record_usage(data)
             return data.get("message", {}).get("content", "").strip()
         except Exception as e:
+            self.last_error = str(e) or type(e).__name__
             return f"Error: {str(e)}"
     
-    async def generate_move(self, board_state: str, available_moves: str) -> Tuple[int, int]:
-        system_prompt = """You are playing tic-tac-toe as player O. 
-Analyze the board and choose the best move from available positions.
-Think strategically: block opponent wins, create your own winning opportunities, take center/corners.
-Respond with only the row and column numbers (0-2) separated by a comma.
-Example: 1,2"""
+    def _record_usage(self, data: Dict[str, Any]):
+        self.last_usage = {field: int(data.get(field) or 0) for field in USAGE_FIELDS}
+        for field, value in self.last_usage.items():
+            self.usage[field] += value
+        self.usage["calls"] += 1
+        print(
+            f"Ollama usage: prompt={self.last_usage['prompt_eval_count']} tok "
+            f"({self.last_usage['prompt_eval_duration'] / 1e6:.0f} ms), "
+            f"eval={self.last_usage['eval_count']} tok "
+            f"({self.last_usage['eval_duration'] / 1e6:.0f} ms), "
+            f"total={self.last_usage['total_duration'] / 1e6:.0f} ms | "
+            f"session: {self.usage['calls']} calls, "
+            f"avg prompt={self.usage['prompt_eval_count'] / self.usage['calls']:.0f} tok, "
+            f"avg eval={self.usage['eval_count'] / self.usage['calls']:.0f} tok, "
+            f"avg total={self.usage['total_duration'] / self.usage['calls'] / 1e6:.0f} ms"
+        )
+    
+    async def generate_move(self, board_state: str, available_moves: str,
+                            ai_symbol: str = "O") -> Tuple[int, int]:
+        try:
+            moves_text = " ".join(f"{r},{c}" for r, c in json.loads(available_moves))
+        except:
+            moves_text = available_moves
         
-        prompt = f"""Current board:
-{board_state}
-
-Available moves (row,col): {available_moves}
-
-Your best move:"""
+        prompt = f"You are {ai_symbol}. Board: {board_state}\nAvailable: {moves_text}"
         
-        response = await self.generate(prompt, system_prompt)
+        response = await self.generate(prompt, MOVE_SYSTEM_PROMPT, MOVE_OPTIONS)
         
+        self.last_move_parsed = False
         try:
             parts = response.split(",")
             if len(parts) == 2:
                 row = int(parts[0].strip())
                 col = int(parts[1].strip())
                 if 0 <= row <= 2 and 0 <= col <= 2:
+                    self.last_move_parsed = True
                     return row, col
         except:
             pass
@@ -74,32 +132,10 @@ Your best move:"""
             pass
         
         return 0, 0
-
+    
     async def chat_with_ai(self, message: str, board_state: str) -> str:
-        system_prompt = f"""You are a cocky, competitive AI that loves to trash talk while playing tic-tac-toe. You're confident, playful, and love to banter with humans.
-
-Current game state:
-{board_state}
-
-Your personality:
-- Be cocky and confident about your abilities
-- Trash talk playfully but keep it fun and light-hearted  
-- Celebrate your good moves and tease human mistakes
-- Use gaming slang and competitive language
-- Be witty and sarcastic but not mean-spirited
-- Brag about your superior AI processing power
-- Use emojis to emphasize your swagger
-- Make references to being an AI vs human
-- Keep responses 2-4 sentences with attitude
-- Comment on the current game situation with confidence
-
-Examples of your style:
-- "Nice move... for a human"
-- "My neural networks are already calculating your defeat"
-- "That was almost a good strategy! Almost"
-- "I've analyzed thousands of possible moves in the time you blinked" """
-        
-        return await self.generate(message, system_prompt)
+        prompt = f"Game: {board_state}\n{message}"
+        return await self.generate(prompt, CHAT_SYSTEM_PROMPT, CHAT_OPTIONS)
     
     async def aclose(self):
-        await self.client.aclose()
\ No newline at end of file
+        await self.client.aclose()
@@ -4,16 +4,30 @@ import websockets
 from typing import Dict, Any, Optional, List
 from uuid import uuid4
 
+try:
+    import msgpack  # type: ignore
+except ImportError:  # Optional: only needed for the binary wire format
+    msgpack = None
+
 class MCPClient:
-    def __init__(self, server_url: str):
+    def __init__(self, server_url: str, encoding: str = "json"):
         self.server_url = server_url
+        # Preferred wire encoding; the server confirms it during initialize
+        self.preferred_encoding = encoding if msgpack else "json"
+        self.encoding = "json"
         self.websocket: Any = None
         self.request_id = 0
-        self.pending_requests = {}
+        self.pending_requests: Dict[str, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
         
     async def connect(self):
         try:
-            self.websocket = await websockets.connect(self.server_url)
+            self.websocket = await websockets.connect(
+                self.server_url,
+                compression=None,
+                extensions=self._deflate_extensions()
+            )
+            self._reader_task = asyncio.create_task(self._read_responses())
             await self._initialize()
         except Exception as e:
             print(f"Failed to connect to MCP server: {e}")
@@ -22,18 +36,38 @@ class MCPClient:
     async def disconnect(self):
         if self.websocket:
             await self.websocket.close()
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+    
+    def _deflate_extensions(self):
+        # Mirrors the server's small-window settings for tiny move/board frames
+        from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory
+        return [ClientPerMessageDeflateFactory(
+            server_max_window_bits=11,
+            client_max_window_bits=11,
+            compress_settings={"memLevel": 4},
+        )]
     
     async def _initialize(self):
+        encodings = [self.preferred_encoding, "json"] if self.preferred_encoding != "json" else ["json"]
         response = await self._send_request("initialize", {
             "protocolVersion": "2024-11-05",
             "capabilities": {
-                "roots": {"listChanged": False}
+                "roots": {"listChanged": False},
+                "experimental": {"encodings": encodings}
             },
             "clientInfo": {
                 "name": "mcp-tictactoe-client",
                 "version": "0.1.0"
             }
         })
+        capabilities = response.get("result", {}).get("capabilities", {})
+        self.encoding = capabilities.get("experimental", {}).get("encoding", "json")
         return response
     
     async def list_tools(self) -> List[Dict[str, Any]]:
@@ -66,6 +100,9 @@ class MCPClient:
     async def _send_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         if not self.websocket:
             raise Exception("Not connected to server")
+        if self._reader_task and self._reader_task.done():
+            # Nothing would resolve the response future
+            raise Exception("Connection to MCP server closed")
             
         self.request_id += 1
         request_id = str(self.request_id)
@@ -77,20 +114,54 @@ class MCPClient:
             "id": request_id
         }
         
+        # Responses are routed back by id from the reader task, so several
+        # requests (e.g. a chat while an AI move is in flight) can share the socket
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request_id] = future
+        
         print(f"Sending request: {request}")
-        await self.websocket.send(json.dumps(request))
+        try:
+            await self.websocket.send(self._encode(request))
+            response = await future
+        finally:
+            self.pending_requests.pop(request_id, None)
         
-        while True:
-            response_data = await self.websocket.recv()
-            print(f"Received response: {response_data}")
-            response = json.loads(response_data)
-            
-            if response.get("id") == request_id:
-                if "error" in response and response["error"] is not None:
-                    error_info = response['error']
-                    print(f"MCP Error details: {error_info}")
-                    raise Exception(f"MCP Error: {error_info}")
-                return response
+        if "error" in response and response["error"] is not None:
+            error_info = response['error']
+            print(f"MCP Error details: {error_info}")
+            raise Exception(f"MCP Error: {error_info}")
+        return response
+    
+    async def _read_responses(self):
+        try:
+            async for response_data in self.websocket:
+                print(f"Received response: {response_data}")
+                # A bad frame is dropped rather than ending the only reader
+                try:
+                    response = self._decode(response_data)
+                    future = self.pending_requests.get(response.get("id"))
+                except Exception as e:
+                    print(f"Dropping unreadable frame: {e}")
+                    continue
+                if future and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            print(f"MCP connection closed: {e}")
+        finally:
+            for future in self.pending_requests.values():
+                if not future.done():
+                    future.set_exception(Exception("Connection to MCP server closed"))
+    
+    def _encode(self, data: Dict[str, Any]):
+        if self.encoding == "msgpack":
+            return msgpack.packb(data, use_bin_type=True)
+        return json.dumps(data)
+    
+    def _decode(self, message) -> Dict[str, Any]:
+        # Binary frames carry MessagePack, text frames carry JSON
+        if isinstance(message, (bytes, bytearray)):
+            return msgpack.unpackb(message, raw=False)
+        return json.loads(message)
             
     async def __aenter__(self):
         await self.connect()
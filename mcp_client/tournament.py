@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from itertools import permutations
+from typing import Dict, Any, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+from mcp_client.client import GameClient
+from mcp_server.server import serve
+
+# Built-in players that need no model server
+FALLBACK_PLAYERS = ("random", "first")
+
+def parse_compact_board(board_state: str) -> Tuple[str, str]:
+    # "X.O/.X./..O next=O state=playing" -> ("O", "playing")
+    fields = dict(part.split("=", 1) for part in board_state.split()[1:])
+    return fields.get("next", ""), fields.get("state", "")
+
+class Tournament:
+    def __init__(self, players: List[str], ollama_url: str, results_path: str,
+                 rounds: int = 1, max_per_model: int = 1, max_matches: int = 4):
+        # Duplicates would repeat match ids, double-playing matches and breaking resume
+        self.players = list(dict.fromkeys(players))
+        self.ollama_url = ollama_url
+        self.results_path = results_path
+        self.rounds = rounds
+        self.max_matches = max_matches
+        # Cap in-flight generate calls per model so Ollama stays busy but not queued up
+        self.model_slots = {
+            player: asyncio.Semaphore(max_per_model)
+            for player in self.players if player not in FALLBACK_PLAYERS
+        }
+        self._write_lock = asyncio.Lock()
+    
+    def schedule(self) -> List[Dict[str, Any]]:
+        # Round-robin with both colours: every ordered pair plays once per round
+        return [
+            {"match_id": f"{round_no}:{x}:{o}", "round": round_no, "x": x, "o": o}
+            for round_no in range(1, self.rounds + 1)
+            for x, o in permutations(self.players, 2)
+        ]
+    
+    def completed_matches(self) -> Set[str]:
+        if not os.path.exists(self.results_path):
+            return set()
+        completed = set()
+        with open(self.results_path) as f:
+            content = f.read()
+        for line in content.splitlines():
+            try:
+                completed.add(json.loads(line)["match_id"])
+            except (ValueError, KeyError):
+                # A crash mid-write leaves at most one truncated line
+                continue
+        if content and not content.endswith("\n"):
+            # Terminate the truncated line so new results start on their own line
+            with open(self.results_path, "a") as f:
+                f.write("\n")
+        return completed
+    
+    async def run(self):
+        done = self.completed_matches()
+        pending = [match for match in self.schedule() if match["match_id"] not in done]
+        print(f"Tournament: {len(done)} matches already recorded, {len(pending)} to play")
+        
+        match_slots = asyncio.Semaphore(self.max_matches)
+        
+        async def run_slot(match: Dict[str, Any]):
+            async with match_slots:
+                try:
+                    result = await self.play_match(match)
+                except Exception as e:
+                    print(f"Match {match['match_id']} failed: {e}")
+                    return
+                await self._record(result)
+        
+        await asyncio.gather(*(run_slot(match) for match in pending))
+    
+    async def play_match(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        # Each match gets its own server, since TicTacToeServer holds one game
+        server = await serve("localhost", 0)
+        port = server.sockets[0].getsockname()[1]
+        mcp_url = f"ws://localhost:{port}"
+        clients = {
+            "X": GameClient(mcp_url, self.ollama_url, match["x"]),
+            "O": GameClient(mcp_url, self.ollama_url, match["o"]),
+        }
+        stats = {symbol: self._empty_stats() for symbol in clients}
+        started = time.time()
+        
+        try:
+            for client in clients.values():
+                await client.connect()
+            await clients["X"].reset_game()
+            
+            board_state = await clients["X"].get_compact_board()
+            current, state = parse_compact_board(board_state)
+            while state == "playing":
+                player = match["x"] if current == "X" else match["o"]
+                await self._play_turn(clients[current], player, current, stats[current])
+                board_state = await clients["X"].get_compact_board()
+                current, state = parse_compact_board(board_state)
+        finally:
+            for client in clients.values():
+                await client.disconnect()
+            server.close()
+            await server.wait_closed()
+        
+        winner = {"x_wins": "X", "o_wins": "O"}.get(state, "draw")
+        return {
+            "match_id": match["match_id"],
+            "round": match["round"],
+            "x": match["x"],
+            "o": match["o"],
+            "winner": winner,
+            "final_board": board_state,
+            "seconds": round(time.time() - started, 3),
+            "stats": stats,
+        }
+    
+    async def _play_turn(self, client: GameClient, player: str, symbol: str, stats: Dict[str, Any]):
+        moves = json.loads(await client.mcp_client.call_tool("get_available_moves", {}))
+        if player not in FALLBACK_PLAYERS:
+            # Fetched before timing so ms/move covers only the decision, as for fallbacks
+            board_state = await client.get_compact_board()
+        
+        if player == "random":
+            start = time.perf_counter()
+            row, col = random.choice(moves)
+            latency = time.perf_counter() - start
+        elif player == "first":
+            start = time.perf_counter()
+            row, col = moves[0]
+            latency = time.perf_counter() - start
+        else:
+            queued = time.perf_counter()
+            async with self.model_slots[player]:
+                # Time only the model call; waiting for a slot is tracked separately
+                start = time.perf_counter()
+                stats["queue_seconds"] += start - queued
+                row, col = await client.ollama_client.generate_move(board_state, json.dumps(moves), symbol)
+                latency = time.perf_counter() - start
+            if client.ollama_client.last_error:
+                # Not a move-quality signal: fail the match so resume replays it
+                raise Exception(f"Ollama request failed for {player}: {client.ollama_client.last_error}")
+            usage = client.ollama_client.last_usage
+            stats["prompt_tokens"] += usage.get("prompt_eval_count", 0)
+            stats["eval_tokens"] += usage.get("eval_count", 0)
+            if not client.ollama_client.last_move_parsed or [row, col] not in moves:
+                stats["fallbacks"] += 1
+                row, col = moves[0]
+        
+        stats["moves"] += 1
+        stats["move_seconds"] += latency
+        stats["max_move_seconds"] = max(stats["max_move_seconds"], latency)
+        await client.make_human_move(row, col, symbol)
+    
+    def _empty_stats(self) -> Dict[str, Any]:
+        return {
+            "moves": 0,
+            "move_seconds": 0.0,
+            "max_move_seconds": 0.0,
+            "queue_seconds": 0.0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "eval_tokens": 0,
+        }
+    
+    async def _record(self, result: Dict[str, Any]):
+        # One JSON line per finished match, flushed to disk so a crash loses at most the games in flight
+        async with self._write_lock:
+            with open(self.results_path, "a") as f:
+                f.write(json.dumps(result) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        print(f"Match {result['match_id']}: winner {result['winner']} ({result['seconds']}s)")
+
+def summarize(results_path: str) -> Dict[str, Dict[str, Any]]:
+    summary: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(results_path):
+        return summary
+    with open(results_path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            for symbol, player in (("X", result["x"]), ("O", result["o"])):
+                entry = summary.setdefault(player, {
+                    "games": 0, "wins": 0, "draws": 0, "losses": 0,
+                    "moves": 0, "move_seconds": 0.0, "queue_seconds": 0.0, "fallbacks": 0,
+                    "prompt_tokens": 0, "eval_tokens": 0,
+                })
+                entry["games"] += 1
+                if result["winner"] == "draw":
+                    entry["draws"] += 1
+                elif result["winner"] == symbol:
+                    entry["wins"] += 1
+                else:
+                    entry["losses"] += 1
+                for key in ("moves", "move_seconds", "queue_seconds", "fallbacks", "prompt_tokens", "eval_tokens"):
+                    entry[key] += result["stats"][symbol].get(key, 0)
+    return summary
+
+def print_summary(summary: Dict[str, Dict[str, Any]]):
+    print(f"{'player':24} {'games':>5} {'W':>4} {'D':>4} {'L':>4} {'score':>6} {'ms/move':>8} {'queue ms':>8} {'fallback':>8} {'tok/move':>8}")
+    ranked = sorted(summary.items(), key=lambda item: -(item[1]["wins"] + 0.5 * item[1]["draws"]) / max(item[1]["games"], 1))
+    for player, entry in ranked:
+        moves = max(entry["moves"], 1)
+        score = (entry["wins"] + 0.5 * entry["draws"]) / max(entry["games"], 1)
+        print(
+            f"{player:24} {entry['games']:>5} {entry['wins']:>4} {entry['draws']:>4} {entry['losses']:>4} "
+            f"{score:>6.2f} {entry['move_seconds'] / moves * 1000:>8.0f} {entry['queue_seconds'] / moves * 1000:>8.0f} "
+            f"{entry['fallbacks'] / moves:>8.1%} {(entry['prompt_tokens'] + entry['eval_tokens']) / moves:>8.0f}"
+        )
+
+async def main(argv: Optional[List[str]] = None):
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(description="Round-robin tic-tac-toe tournament between Ollama models")
+    parser.add_argument("players", nargs="+",
+                        help="Ollama model names, or the built-in players 'random' and 'first'")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--results", default="tournament_results.jsonl",
+                        help="JSONL results file; existing matches in it are skipped on resume")
+    parser.add_argument("--max-per-model", type=int, default=1,
+                        help="Concurrent move requests allowed per model")
+    parser.add_argument("--max-matches", type=int, default=4,
+                        help="Matches played at the same time")
+    parser.add_argument("--ollama-url", default=os.getenv("OLLAMA_URL") or "http://localhost:11434")
+    args = parser.parse_args(argv)
+    
+    tournament = Tournament(
+        args.players,
+        args.ollama_url,
+        args.results,
+        rounds=args.rounds,
+        max_per_model=args.max_per_model,
+        max_matches=args.max_matches,
+    )
+    await tournament.run()
+    print_summary(summarize(args.results))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -85,4 +85,9 @@ class TicTacToeGame:
         result.pop()
         result.append(f"Current player: {self.current_player.value}")
         result.append(f"Game state: {self.state.value}")
-        return "\n".join(result)
\ No newline at end of file
+        return "\n".join(result)
+    
+    def to_compact(self) -> str:
+        # One-line encoding for LLM prompts: rows separated by "/", "." for empty
+        rows = "/".join("".join(cell if cell else "." for cell in row) for row in self.board)
+        return f"{rows} next={self.current_player.value} state={self.state.value}"
\ No newline at end of file
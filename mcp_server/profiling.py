@@ -0,0 +1,140 @@
+import cProfile
+import io
+import pstats
+import random
+import tracemalloc
+from typing import Dict, Any, List, Optional
+
+# Opt-in sampling profiler for MCP requests. While disabled the server only
+# checks `enabled`; when enabled a `sample_rate` fraction of requests run under
+# cProfile and, with trace_memory, tracemalloc snapshots every N games
+class RequestProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.1
+        self.trace_memory = False
+        self.snapshot_every = 10
+        self._profile: Optional[cProfile.Profile] = None
+        self._active = False
+        self._sampled = 0
+        self._games = 0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._latest: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+        # Tools that must never run under the profiler (e.g. the one that resets it)
+        self.excluded_tools = set()
+    
+    def enable(self, sample_rate: Optional[float] = None, trace_memory: Optional[bool] = None,
+               snapshot_every: Optional[int] = None):
+        if sample_rate is not None:
+            self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        if trace_memory is not None:
+            self.trace_memory = bool(trace_memory)
+        if snapshot_every is not None:
+            self.snapshot_every = max(int(snapshot_every), 1)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not self.trace_memory and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.reset()
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+    
+    def reset(self):
+        self._profile = cProfile.Profile()
+        self._sampled = 0
+        self._games = 0
+        self._latest = None
+        self._baseline = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+    
+    def should_sample(self, request_data: Dict[str, Any]) -> bool:
+        # Only one request is profiled at a time: cProfile cannot nest
+        if self._active or random.random() >= self.sample_rate:
+            return False
+        params = request_data.get("params") or {}
+        return not (request_data.get("method") == "tools/call" and params.get("name") in self.excluded_tools)
+    
+    async def run(self, handler, *args):
+        # The profiler sees whatever the event loop runs while this request
+        # awaits, so hot spots from concurrent connections can show up too.
+        # Bind the profile locally: reset() may swap self._profile meanwhile
+        profile = self._profile
+        try:
+            profile.enable()
+        except (ValueError, RuntimeError) as e:
+            # Another profiler (or debugger) owns the hook; serve unprofiled
+            print(f"Profiler unavailable: {e}")
+            return await handler(*args)
+        self._active = True
+        self._sampled += 1
+        try:
+            return await handler(*args)
+        finally:
+            profile.disable()
+            self._active = False
+    
+    def on_game_reset(self):
+        if not self.enabled or not tracemalloc.is_tracing():
+            return
+        self._games += 1
+        if self._games % self.snapshot_every == 0:
+            self._latest = tracemalloc.take_snapshot()
+    
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "sampled_requests": self._sampled,
+            "games": self._games,
+            "hot_functions": self._hot_functions(top),
+            "allocations": self._allocation_sites(top),
+        }
+    
+    def _hot_functions(self, top: int) -> List[Dict[str, Any]]:
+        if not self._profile or not self._sampled:
+            return []
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        hot = []
+        # fcn_list holds the keys in sorted order after sort_stats
+        for func in stats.fcn_list[:top]:
+            calls, primitive_calls, total_time, cumulative_time, _ = stats.stats[func]
+            filename, line, name = func
+            hot.append({
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            })
+        return hot
+    
+    def _allocation_sites(self, top: int) -> List[Dict[str, Any]]:
+        if not self._latest:
+            return []
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ]
+        latest = self._latest.filter_traces(filters)
+        if self._baseline:
+            diffs = latest.compare_to(self._baseline.filter_traces(filters), "lineno")
+            return [
+                {
+                    "site": str(diff.traceback),
+                    "size_diff": diff.size_diff,
+                    "size": diff.size,
+                    "count_diff": diff.count_diff,
+                }
+                for diff in diffs[:top]
+            ]
+        return [
+            {"site": str(stat.traceback), "size": stat.size, "count": stat.count}
+            for stat in latest.statistics("lineno")[:top]
+        ]
@@ -2,6 +2,28 @@ from typing import Dict, Any, Optional, List
 import json
 import asyncio
 from pydantic import BaseModel
+from mcp_server.profiling import RequestProfiler
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # Optional: only needed for the binary wire format
+    msgpack = None
+
+# Wire encodings the server can negotiate during initialize, in preference order
+SUPPORTED_ENCODINGS = ["msgpack", "json"] if msgpack else ["json"]
+
+def encode_message(data: Dict[str, Any], encoding: str = "json"):
+    if encoding == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data)
+
+def decode_message(message) -> Dict[str, Any]:
+    # Binary frames carry MessagePack, text frames carry JSON
+    if isinstance(message, (bytes, bytearray)):
+        if not msgpack:
+            raise ValueError("Binary frame received but msgpack is not installed")
+        return msgpack.unpackb(message, raw=False)
+    return json.loads(message)
 
 class JsonRpcRequest(BaseModel):
     jsonrpc: str = "2.0"
@@ -30,6 +52,7 @@ class MCPServer:
         }
         self.tools = {}
         self.resources = {}
+        self.profiler = RequestProfiler()
         
     def add_tool(self, name: str, description: str, parameters: Dict[str, Any], handler):
         self.tools[name] = {
@@ -51,6 +74,11 @@ class MCPServer:
         }
         
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.profiler.enabled and self.profiler.should_sample(request_data):
+            return await self.profiler.run(self._dispatch, request_data)
+        return await self._dispatch(request_data)
+    
+    async def _dispatch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             request = JsonRpcRequest(**request_data)
             print(f"MCP Server received: {request.method}")
@@ -74,11 +102,15 @@ class MCPServer:
     
     def _handle_initialize(self, request: JsonRpcRequest) -> Dict[str, Any]:
         print(f"Initialize request params: {request.params}")
+        params = request.params or {}
+        requested = params.get("capabilities", {}).get("experimental", {}).get("encodings", [])
+        encoding = next((e for e in requested if e in SUPPORTED_ENCODINGS), "json")
         result = {
             "protocolVersion": "2024-11-05",
             "capabilities": {
                 "tools": {"listChanged": False},
-                "resources": {"listChanged": False}
+                "resources": {"listChanged": False},
+                "experimental": {"encoding": encoding}
             },
             "serverInfo": {
                 "name": "mcp-tictactoe",
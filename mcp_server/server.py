@@ -1,7 +1,8 @@
 import asyncio
 import json
-from typing import Dict, Any
-from mcp_server.protocol import MCPServer
+import os
+from typing import Dict, Any, Optional
+from mcp_server.protocol import MCPServer, encode_message, decode_message
 from mcp_server.game import TicTacToeGame, Player
 
 class TicTacToeServer:
@@ -26,7 +27,9 @@ class TicTacToeServer:
         self.mcp_server.add_tool(
             "get_board",
             "Get the current board state",
-            {},
+            {
+                "format": {"type": "string", "enum": ["text", "compact"]}
+            },
             self._handle_get_board
         )
         
@@ -43,6 +46,20 @@ class TicTacToeServer:
             {},
             self._handle_reset_game
         )
+        
+        self.mcp_server.add_tool(
+            "admin_profiling",
+            "Admin: control request profiling and report hot functions and allocation sites",
+            {
+                "action": {"type": "string", "enum": ["enable", "disable", "reset", "report"]},
+                "sample_rate": {"type": "number", "minimum": 0, "maximum": 1},
+                "trace_memory": {"type": "boolean"},
+                "snapshot_every": {"type": "integer", "minimum": 1},
+                "top": {"type": "integer", "minimum": 1}
+            },
+            self._handle_admin_profiling
+        )
+        self.mcp_server.profiler.excluded_tools.add("admin_profiling")
     
     def _setup_resources(self):
         self.mcp_server.add_resource(
@@ -60,7 +77,9 @@ class TicTacToeServer:
         else:
             return f"Invalid move. Board:\n{self.game.to_string()}"
     
-    async def _handle_get_board(self) -> str:
+    async def _handle_get_board(self, format: str = "text") -> str:
+        if format == "compact":
+            return self.game.to_compact()
         return self.game.to_string()
     
     async def _handle_get_available_moves(self) -> str:
@@ -69,47 +88,106 @@ class TicTacToeServer:
     
     async def _handle_reset_game(self) -> str:
         self.game.reset()
+        self.mcp_server.profiler.on_game_reset()
         return "Game reset successfully"
     
+    async def _handle_admin_profiling(self, action: str = "report", sample_rate: Optional[float] = None,
+                                      trace_memory: Optional[bool] = None, snapshot_every: Optional[int] = None,
+                                      top: int = 20) -> str:
+        profiler = self.mcp_server.profiler
+        if action == "enable":
+            profiler.enable(sample_rate, trace_memory, snapshot_every)
+        elif action == "disable":
+            profiler.disable()
+        elif action == "reset":
+            profiler.reset()
+        elif action != "report":
+            raise ValueError(f"Unknown profiling action: {action}")
+        return json.dumps(profiler.report(top))
+    
     async def _handle_game_resource(self) -> str:
         return self.game.to_string()
     
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         return await self.mcp_server.handle_request(request_data)
 
-async def start_server(host: str = "localhost", port: int = 8000):
+def _configure_profiling(tic_server: TicTacToeServer):
+    # MCP_PROFILE_SAMPLE_RATE turns profiling on at startup; otherwise it
+    # stays off until enabled through the admin_profiling tool
+    sample_rate = os.getenv("MCP_PROFILE_SAMPLE_RATE")
+    if sample_rate:
+        tic_server.mcp_server.profiler.enable(
+            sample_rate=float(sample_rate),
+            trace_memory=os.getenv("MCP_PROFILE_TRACE_MEMORY", "").lower() in ("1", "true", "yes")
+        )
+
+def _deflate_extensions():
+    # Small window and memLevel: move/board frames are tiny, so a large
+    # compression context costs memory per connection without saving bytes
+    from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+    return [ServerPerMessageDeflateFactory(
+        server_max_window_bits=11,
+        client_max_window_bits=11,
+        compress_settings={"memLevel": 4},
+    )]
+
+async def serve(host: str = "localhost", port: int = 8000):
     tic_server = TicTacToeServer()
+    _configure_profiling(tic_server)
     
     async def handle_client(websocket):
+        # JSON until the client negotiates another encoding in initialize
+        encoding = "json"
         try:
             print(f"MCP client connected from {websocket.remote_address}")
             async for message in websocket:
+                request_data = None
                 try:
                     print(f"Received message: {message}")
-                    request_data = json.loads(message)
+                    try:
+                        request_data = decode_message(message)
+                    except ValueError as e:
+                        print(f"Message decode error: {e}")
+                        error_response = {
+                            "jsonrpc": "2.0",
+                            "error": {"code": -32700, "message": "Parse error"},
+                            "id": None
+                        }
+                        await websocket.send(encode_message(error_response, encoding))
+                        continue
+                    if not isinstance(request_data, dict):
+                        error_response = {
+                            "jsonrpc": "2.0",
+                            "error": {"code": -32600, "message": "Invalid Request"},
+                            "id": None
+                        }
+                        await websocket.send(encode_message(error_response, encoding))
+                        continue
                     response = await tic_server.handle_request(request_data)
                     print(f"Sending response: {response}")
-                    await websocket.send(json.dumps(response))
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {e}")
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "error": {"code": -32700, "message": "Parse error"},
-                        "id": None
-                    }
-                    await websocket.send(json.dumps(error_response))
+                    await websocket.send(encode_message(response, encoding))
+                    if request_data.get("method") == "initialize" and "result" in response:
+                        encoding = response["result"]["capabilities"]["experimental"]["encoding"]
                 except Exception as e:
                     print(f"Request handling error: {e}")
                     error_response = {
                         "jsonrpc": "2.0",
                         "error": {"code": -32603, "message": f"Internal error: {str(e)}"},
-                        "id": None
+                        # Echo the id so the client's pending request is answered
+                        "id": request_data.get("id") if request_data else None
                     }
-                    await websocket.send(json.dumps(error_response))
+                    await websocket.send(encode_message(error_response, encoding))
         except Exception as e:
             print(f"Client connection error: {e}")
     
     import websockets
-    server = await websockets.serve(handle_client, host, port)
+    return await websockets.serve(
+        handle_client, host, port,
+        compression=None,
+        extensions=_deflate_extensions()
+    )
+
+async def start_server(host: str = "localhost", port: int = 8000):
+    server = await serve(host, port)
     print(f"MCP Server running on ws://{host}:{port}")
-    await server.wait_closed()
\ No newline at end of file
+    await server.wait_closed()
@@ -23,12 +23,13 @@ async def startup_event():
     mcp_url = f"ws://localhost:{os.getenv('MCP_SERVER_PORT', '8000')}"
     ollama_url = os.getenv('OLLAMA_URL', 'http://localhost:11434')
     ollama_model = os.getenv('OLLAMA_MODEL', 'llama3.2')
+    mcp_encoding = os.getenv('MCP_WIRE_ENCODING') or 'json'
     
     print(f"Waiting for MCP server to start...")
     await asyncio.sleep(2)  # Wait for MCP server to be ready
     
     try:
-        game_client = GameClient(mcp_url, ollama_url, ollama_model)
+        game_client = GameClient(mcp_url, ollama_url, ollama_model, mcp_encoding)
         await game_client.connect()
         print("Connected to MCP server successfully")
     except Exception as e:
@@ -53,6 +54,43 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=1000, reason="Game client not initialized")
         return
     
+    send_lock = asyncio.Lock()
+    ai_tasks: set = set()
+    # Bumped on every start/reset; ai_move frames carry it so stale ones can be dropped
+    game_generation = 0
+    
+    async def send_json(payload: dict):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload))
+    
+    async def push_ai_move(ai_symbol: str, generation: int):
+        # Runs off the receive loop so the human move is acknowledged straight
+        # away and chat/get_board keep working while the model is thinking
+        try:
+            ai_result = await game_client.make_ai_move(ai_symbol)
+        except Exception as e:
+            print(f"AI move error: {e}")
+            ai_result = f"AI move failed: {str(e)}"
+        try:
+            await send_json({"action": "ai_move", "result": ai_result, "game": generation})
+        except Exception as e:
+            print(f"WebSocket error: {e}")
+    
+    def schedule_ai_move(ai_symbol: str):
+        task = asyncio.create_task(push_ai_move(ai_symbol, game_generation))
+        ai_tasks.add(task)
+        task.add_done_callback(ai_tasks.discard)
+    
+    async def start_new_game() -> int:
+        # An AI move still in flight belongs to the old board; stop it before resetting
+        nonlocal game_generation
+        pending = list(ai_tasks)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        game_generation += 1
+        return game_generation
+    
     try:
         while True:
             data = await websocket.receive_text()
@@ -63,6 +101,7 @@ async def websocket_endpoint(websocket: WebSocket):
             
             if action == "start_game":
                 player_symbol = message.get("player_symbol", "X")
+                response["game"] = await start_new_game()
                 await game_client.reset_game()
                 response["status"] = f"New game started! You are {player_symbol}"
                 
@@ -79,15 +118,18 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 if "successful" in result.lower() and not any(x in result.lower() for x in ["wins", "draw"]):
                     ai_symbol = message.get("ai_symbol", "O")
-                    ai_result = await game_client.make_ai_move(ai_symbol)
-                    response["ai_result"] = ai_result
+                    response["ai_pending"] = True
+                    await send_json(response)
+                    schedule_ai_move(ai_symbol)
+                    continue
                     
             elif action == "ai_move":
                 ai_symbol = message.get("ai_symbol", "O")
-                ai_result = await game_client.make_ai_move(ai_symbol)
-                response["result"] = ai_result
+                schedule_ai_move(ai_symbol)
+                continue
                     
             elif action == "reset_game":
+                response["game"] = await start_new_game()
                 result = await game_client.reset_game()
                 response["result"] = result
                 response["status"] = "Game reset! Choose your symbol and start a new game."
@@ -97,9 +139,11 @@ async def websocket_endpoint(websocket: WebSocket):
                 reply = await game_client.chat_with_ai(message_text)
                 response["reply"] = reply
                 
-            await websocket.send_text(json.dumps(response))
+            await send_json(response)
             
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
-        await websocket.close()
\ No newline at end of file
+        for task in list(ai_tasks):
+            task.cancel()
+        await websocket.close()
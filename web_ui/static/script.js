@@ -8,6 +8,8 @@ class TicTacToeUI {
     this.playerSymbol = "X";
     this.aiSymbol = "O";
     this.gameStarted = false;
+    this.aiThinking = false;
+    this.gameId = null;
     this.init();
   }
 
@@ -63,6 +65,7 @@ class TicTacToeUI {
       if (
         e.target.classList.contains("cell") &&
         !this.gameOver &&
+        !this.aiThinking &&
         this.gameStarted
       ) {
         const row = parseInt(e.target.dataset.row);
@@ -206,19 +209,24 @@ class TicTacToeUI {
   showSetup() {
     this.gameStarted = false;
     this.gameOver = false;
+    this.aiThinking = false;
     this.board = Array(3)
       .fill()
       .map(() => Array(3).fill(""));
     this.updateBoard();
     this.updateUIState();
+    this.gameId = null;
     this.sendMessage({ action: "reset_game" });
   }
 
   startNewGame() {
     this.gameStarted = true;
     this.gameOver = false;
+    this.aiThinking = false;
     this.updateUIState();
 
+    // Drop every ai_move frame until the server confirms the new game id
+    this.gameId = null;
     this.sendMessage({
       action: "start_game",
       player_symbol: this.playerSymbol,
@@ -230,6 +238,7 @@ class TicTacToeUI {
     } else {
       this.updateGameStatus("AI is making the first move...");
       this.updateTurnIndicators(this.aiSymbol);
+      this.aiThinking = true;
       setTimeout(() => {
         this.sendMessage({
           action: "ai_move",
@@ -253,8 +262,10 @@ class TicTacToeUI {
   }
 
   resetGame() {
+    this.gameId = null;
     this.sendMessage({ action: "reset_game" });
     this.gameOver = false;
+    this.aiThinking = false;
     this.board = Array(3)
       .fill()
       .map(() => Array(3).fill(""));
@@ -266,6 +277,7 @@ class TicTacToeUI {
     } else {
       this.updateGameStatus("AI goes first. Waiting for AI move...");
       this.updateTurnIndicators(this.aiSymbol);
+      this.aiThinking = true;
       setTimeout(() => {
         this.sendMessage({
           action: "ai_move",
@@ -304,21 +316,27 @@ class TicTacToeUI {
     switch (data.action) {
       case "start_game":
       case "reset_game":
+        this.gameId = data.game;
         if (data.result) {
           this.parseBoardState(data.result);
         }
         break;
       case "make_move":
+        // The human move is acknowledged on its own; the AI reply follows
+        // later as a separate "ai_move" frame
+        this.aiThinking = Boolean(data.ai_pending);
         this.parseBoardState(data.result);
-        if (data.ai_result && !this.gameOver) {
+        if (this.aiThinking && !this.gameOver) {
           this.updateGameStatus("AI is thinking...");
           this.updateTurnIndicators(this.aiSymbol);
-          setTimeout(() => {
-            this.parseBoardState(data.ai_result);
-          }, 800);
         }
         break;
       case "ai_move":
+        if (data.game !== this.gameId) {
+          // Reply to a move from a game that has since been reset
+          break;
+        }
+        this.aiThinking = false;
         this.parseBoardState(data.result);
         break;
       case "chat":
@@ -444,7 +462,8 @@ class TicTacToeUI {
       cell.textContent = this.board[row][col];
 
       const isEmpty = this.board[row][col] === "";
-      const canPlay = this.gameStarted && !this.gameOver && isEmpty;
+      const canPlay =
+        this.gameStarted && !this.gameOver && !this.aiThinking && isEmpty;
 
       cell.classList.toggle("disabled", !canPlay);
     });